@@ -11,6 +11,15 @@ Usage:
   python validate_wmibo_solution.py instance.wmibo --sol solution.txt
   wmibo.exe instance.wmibo > out.txt && python validate_wmibo_solution.py instance.wmibo --sol out.txt
   cat out.txt | python validate_wmibo_solution.py instance.wmibo
+  python validate_wmibo_solution.py instance.wmibo --sol out.txt --cache   (reuse parsed instance)
+
+Optional acceleration:
+  With WMIBO_NUMBA=1 and numba installed, clause and linear evaluation run in the
+  JIT kernels of wmibo_kernels.py (next to this script); see that module for its
+  switches.
+  On a free-threaded Python, or with the kernels compiled single-threaded
+  (WMIBO_NUMBA_PARALLEL=0), the four clause pools and the linear rows are
+  evaluated on a thread pool (up to os.cpu_count() threads).
 
 Exit codes:
   0 = OK
@@ -20,18 +29,35 @@ Exit codes:
 © Oscar Riveros. Todos los derechos reservados. 
 """
 import argparse
+import gc
+import hashlib
 import math
-import re
+import operator
+import os
+import pickle
+import struct
 import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial, reduce
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+
+try:
+    # Optional JIT kernels (sibling module; only active with WMIBO_NUMBA=1 and numba installed)
+    import wmibo_kernels
+except ImportError:
+    wmibo_kernels = None
 
 INF = 1e300
 
 # ---------- Data structures ----------
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl:
     kind: str  # 'b','i','r'
     idx: int
@@ -40,13 +66,16 @@ class VarDecl:
     free: bool = False
     binary: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class Clause:
     hard: bool
     weight: int
-    lits: List[Tuple[int, bool]]  # (b_index, neg)
+    lits: array  # 'q' signed literals (DIMACS style): bi for b<bi>, -bi for ~b<bi>
+    index: int = 0    # 1-based position in its pool as written in the file (0 = unknown)
+    copies: int = 1   # identical clauses of the same pool merged into this one
+    taut: int = 0     # smallest bi with both b<bi> and ~b<bi> in lits (0 = not a tautology)
 
-@dataclass
+@dataclass(slots=True)
 class LinConstr:
     cid: str
     sense: str  # <=, >=, =
@@ -55,7 +84,7 @@ class LinConstr:
 
 IndicatorVal = Union[Tuple[int, bool], Tuple[str]]  # (bi,neg) or ("CONFLICT",)
 
-@dataclass
+@dataclass(slots=True)
 class WMIBO:
     B: int
     I: int
@@ -70,20 +99,56 @@ class WMIBO:
     obj_sense: Optional[str]      # min|max|None
     obj_terms: List[Tuple[float, str, int]]
     opts: Dict[str, float]        # feas_tol, int_tol, ...
+    # pool name ("cnf_hard", ...) -> CSR-packed copy of that pool, see pack_clauses
+    packed: Dict[str, "PackedClauses"] = field(default_factory=dict)
+    # lin constraints (in w.lin order) plus the objective as the last row, see pack_lin
+    packed_lin: Optional["LinMatrix"] = None
+    # booleans above B that a clause or indicator refers to -> their slot B+1, B+2, ...
+    # in the packed literal codes and truth tables, see overflow_codes
+    b_slots: Dict[int, int] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class PackedClauses:
+    """A clause pool in CSR form: clause j's literal codes (2*bi + neg) are lits[ptr[j]:ptr[j+1]]."""
+    lits: array       # 'q' literal codes
+    ptr: array        # 'q' offsets, len(pool) + 1 entries
+    weight: List[int]
+    max_var: int
+    # Dense pools also get per-clause bitsets over b0..b<max_var> (bit k <-> b<k>):
+    # positive-literal masks, negative-literal masks, and their union over the pool.
+    pos_mask: Optional[List[int]] = None
+    neg_mask: Optional[List[int]] = None
+    var_mask: int = 0
+
+@dataclass(slots=True)
+class LinMatrix:
+    """Linear rows in CSR form over flat columns b1..bB, i1..iI, r1..rR, one column per
+    variable beyond the header counts (extra), plus one never-assigned column."""
+    cols: array       # 'q'
+    coef: array       # 'd'
+    ptr: array        # 'q' offsets, rows + 1 entries
+    n_b: int
+    n_i: int
+    n_r: int
+    extra: List[Tuple[str, int]] = field(default_factory=list)  # (kind, idx) of each overflow column
+    # Per row: indicator literal code 2*bi + neg, IND_NONE or IND_CONFLICT (see indicator_codes)
+    ind_code: array = field(default_factory=lambda: array("q"))
+    ind_max_var: int = 0
+
+# Indicator sentinels; as negative indices they select the two entries that
+# validate appends to the literal truth table.
+IND_NONE = -1       # no indicator: always active
+IND_CONFLICT = -2   # conflicting indicators
+
+CLAUSE_POOLS = ("cnf_hard", "cnf_soft", "wcnf_hard", "wcnf_soft")
+
+# A pool gets bitset masks when its mean clause length is at least max_var / BITSET_DENSITY,
+# i.e. when one mask (max_var / 64 machine words) costs no more than walking the literals.
+BITSET_DENSITY = 64
 
 
 # ---------- Parsing helpers ----------
 
-def is_comment(line: str) -> bool:
-    if not line:
-        return True
-    if line[0] == '#':
-        return True
-    # DIMACS-style: comment is "c" followed by whitespace/end; NOT "cl"
-    if line[0] == 'c' and (len(line) == 1 or line[1].isspace()):
-        return True
-    return False
-
 def parse_lit(tok: str) -> Tuple[int, bool]:
     neg = False
     if tok.startswith("~"):
@@ -92,197 +157,446 @@ def parse_lit(tok: str) -> Tuple[int, bool]:
     if not tok.startswith("b") or not tok[1:].isdigit():
         raise ValueError(f"bad literal token: {tok!r}")
     bi = int(tok[1:])
+    if bi == 0:
+        raise ValueError(f"bad literal token: {tok!r} (indices start at 1)")
     return bi, neg
 
-def parse_var(tok: str) -> Tuple[str, int]:
-    if len(tok) < 2 or tok[0] not in "bir" or not tok[1:].isdigit():
-        raise ValueError(f"bad var token: {tok!r}")
-    return tok[0], int(tok[1:])
-
 def parse_bounds(tok: str) -> Tuple[float, float]:
-    m = re.match(r"^\[(.*?),(.*?)\]$", tok)
-    if not m:
+    if len(tok) < 2 or tok[0] != "[" or tok[-1] != "]" or "," not in tok:
         raise ValueError(f"bad bounds: {tok!r}")
-    return float(m.group(1)), float(m.group(2))
-
-def parse_wmibo(path: str) -> WMIBO:
-    txt = Path(path).read_text(encoding="utf-8", errors="replace").splitlines()
-
-    B = I = R = 0
-    vars_: Dict[Tuple[str, int], VarDecl] = {}
-    cnf_hard: List[Clause] = []
-    cnf_soft: List[Clause] = []
-    wcnf_hard: List[Clause] = []
-    wcnf_soft: List[Clause] = []
-    lin: Dict[str, LinConstr] = {}
-    ind: Dict[str, IndicatorVal] = {}
-    obj_sense: Optional[str] = None
-    obj_terms: List[Tuple[float, str, int]] = []
-    opts: Dict[str, float] = {"feas_tol": 1e-8, "int_tol": 1e-6}
-
-    block: Optional[str] = None
-    saw_header = False
-
-    for raw in txt:
-        line = raw.strip()
-        if not line or is_comment(line):
-            continue
-
-        if line.startswith("p "):
-            parts = line.split()
-            if len(parts) < 5 or parts[1] != "wmibo":
-                raise ValueError("invalid header line")
-            # Accept both:
-            #   p wmibo 1 B I R ...
-            #   p wmibo B I R ...
-            if len(parts) >= 6 and parts[2].isdigit() and int(parts[2]) == 1:
-                B, I, R = int(parts[3]), int(parts[4]), int(parts[5])
-            else:
-                B, I, R = int(parts[2]), int(parts[3]), int(parts[4])
-            saw_header = True
-            continue
-
-        if line.startswith("begin "):
-            block = line.split()[1]
-            continue
-        if line == "end":
-            block = None
-            continue
-
-        if line.startswith("opt "):
-            _, k, v = line.split(maxsplit=2)
-            try:
-                opts[k] = float(v)
-            except ValueError:
-                # ignore non-numeric opts in validator
-                pass
-            continue
-
-        if line.startswith("var "):
-            parts = line.split()
-            if len(parts) < 4:
-                raise ValueError(f"bad var line: {line}")
-            kind = parts[1]
-            idx = int(parts[2])
-            spec = parts[3]
-            if spec == "bin":
-                vars_[(kind, idx)] = VarDecl(kind, idx, 0.0, 1.0, binary=True)
-            elif spec == "free":
-                vars_[(kind, idx)] = VarDecl(kind, idx, -INF, INF, free=True)
-            else:
-                lo, hi = parse_bounds(spec)
-                vars_[(kind, idx)] = VarDecl(kind, idx, lo, hi)
-            continue
-
-        # ---- block content ----
-        if block == "cnf":
-            parts = line.split()
-            if parts[0] != "cl" or parts[1] not in ("hard", "soft"):
-                raise ValueError(f"bad cnf clause line: {line}")
-            hard = (parts[1] == "hard")
-            lits: List[Tuple[int, bool]] = []
-            for tok in parts[2:]:
-                if tok == "0":
-                    break
-                lits.append(parse_lit(tok))
-            cl = Clause(hard=hard, weight=1, lits=lits)  # cl soft has weight 1 by convention
-            (cnf_hard if hard else cnf_soft).append(cl)
+    lo, hi = tok[1:-1].split(",", 1)
+    return float(lo), float(hi)
+
+def parse_lin_terms(toks: List[str], line: str, what: str) -> List[Tuple[float, str, int]]:
+    """Parse '<coef> <var> <coef> <var> ...' tokens (hot path)."""
+    if len(toks) % 2 != 0:
+        raise ValueError(f"odd number of tokens in {what} expr: {line}")
+    terms: List[Tuple[float, str, int]] = []
+    for j in range(0, len(toks), 2):
+        coef = float(toks[j])
+        tok = toks[j + 1]
+        kind = tok[0]
+        if len(tok) < 2 or kind not in "bir" or not tok[1:].isdigit():
+            raise ValueError(f"bad var token: {tok!r}")
+        idx = int(tok[1:])
+        if idx == 0:
+            raise ValueError(f"bad var token: {tok!r} (indices start at 1)")
+        terms.append((coef, kind, idx))
+    return terms
+
+def parse_clause_lits(toks: List[str]) -> Tuple[array, int]:
+    """(signed literals up to the terminating '0' without repeats, taut) as in Clause (parse_lit inlined)."""
+    lits: List[int] = []
+    append = lits.append
+    for tok in toks:
+        if tok == "0":
+            break
+        if tok[0] == "~":
+            if tok[1:2] != "b" or not tok[2:].isdigit():
+                raise ValueError(f"bad literal token: {tok[1:]!r}")
+            append(-int(tok[2:]))
+        else:
+            if tok[0] != "b" or not tok[1:].isdigit():
+                raise ValueError(f"bad literal token: {tok!r}")
+            append(int(tok[1:]))
+    if 0 in lits:
+        tok = next(t for t in toks if t != "0" and int(t.lstrip("~")[1:]) == 0)
+        raise ValueError(f"bad literal token: {tok.lstrip('~')!r} (indices start at 1)")
+    # One C-level pass tells the common case (no variable repeated) apart.
+    if len(set(map(abs, lits))) < len(lits):
+        return normalize_lits(lits)
+    return array("q", lits), 0
+
+def normalize_lits(lits: List[int]) -> Tuple[array, int]:
+    """(lits without repeated literals, smallest tautological variable or 0), in linear time."""
+    seen: Set[int] = set()
+    out: List[int] = []
+    taut = 0
+    for s in lits:
+        if s in seen:
             continue
+        if -s in seen:
+            bi = abs(s)
+            if taut == 0 or bi < taut:
+                taut = bi
+        seen.add(s)
+        out.append(s)
+    return array("q", out), taut
+
+# ---- block line parsers: (instance under construction, stripped line) -> None ----
+
+def _parse_cnf_line(w: WMIBO, line: str) -> None:
+    parts = line.split()
+    if parts[0] != "cl" or parts[1] not in ("hard", "soft"):
+        raise ValueError(f"bad cnf clause line: {line}")
+    hard = (parts[1] == "hard")
+    lits, taut = parse_clause_lits(parts[2:])
+    cl = Clause(hard=hard, weight=1, lits=lits, taut=taut)  # cl soft has weight 1 by convention
+    (w.cnf_hard if hard else w.cnf_soft).append(cl)
+
+def _parse_wcnf_line(w: WMIBO, line: str) -> None:
+    parts = line.split()
+    if parts[0] != "wcl" or len(parts) < 4 or parts[2] not in ("hard", "soft"):
+        raise ValueError(f"bad wcnf clause line: {line}")
+    hard = (parts[2] == "hard")
+    lits, taut = parse_clause_lits(parts[3:])
+    cl = Clause(hard=hard, weight=int(parts[1]), lits=lits, taut=taut)
+    (w.wcnf_hard if hard else w.wcnf_soft).append(cl)
+
+def _parse_lin_line(w: WMIBO, line: str) -> None:
+    # lc <cid> <sense> <rhs> : <terms>
+    head, colon, rest = line.partition(":")
+    parts = head.split()
+    if (not colon or len(parts) != 4 or parts[0] != "lc"
+            or parts[2] not in ("<=", ">=", "=") or not parts[1].replace("_", "a").isalnum()):
+        raise ValueError(f"bad linear constraint line: {line}")
+    cid = parts[1]
+    rhs = float(parts[3])
+    terms = parse_lin_terms(rest.split(), line, "lin")
+    if cid in w.lin:
+        raise ValueError(f"duplicate linear constraint id: {cid}")
+    w.lin[cid] = LinConstr(cid=cid, sense=parts[2], rhs=rhs, terms=terms)
+
+def _parse_ind_line(w: WMIBO, line: str) -> None:
+    # ind <whitespace> [~]b<digits> [whitespace] => [whitespace] <word>
+    parts = line.split()
+    if len(parts) == 4 and parts[0] == "ind" and parts[2] == "=>":
+        lit_tok, cid = parts[1], parts[3]
+    else:  # no whitespace around "=>"
+        head, arrow, cid = line[3:].partition("=>")
+        lit_tok, cid = head.strip(), cid.lstrip()
+        if not line.startswith("ind") or not head[:1].isspace() or not arrow:
+            raise ValueError(f"bad indicator line: {line}")
+    # cid must be a regex \w+ word (letters, digits, '_')
+    if not cid.replace("_", "x").isalnum():
+        raise ValueError(f"bad indicator line: {line}")
+    try:
+        lit = parse_lit(lit_tok)
+    except ValueError:
+        raise ValueError(f"bad indicator line: {line}") from None
+    if cid in w.ind and w.ind[cid] != lit:
+        w.ind[cid] = ("CONFLICT",)
+    else:
+        w.ind[cid] = lit
+
+def _parse_obj_line(w: WMIBO, line: str) -> None:
+    # obj <whitespace> min|max [whitespace] : [whitespace] lin <terms>
+    head, colon, rest = line[3:].partition(":")
+    sense = head.strip()
+    rest = rest.lstrip()
+    if (not line.startswith("obj") or not head[:1].isspace() or not colon
+            or sense not in ("min", "max") or not rest.startswith("lin")):
+        raise ValueError(f"bad obj line: {line}")
+    w.obj_sense = sense
+    w.obj_terms = parse_lin_terms(rest[3:].split(), line, "obj")
+
+BLOCK_DISPATCH: Dict[str, Callable[[WMIBO, str], None]] = {
+    "cnf": _parse_cnf_line,
+    "wcnf": _parse_wcnf_line,
+    "lin": _parse_lin_line,
+    "ind": _parse_ind_line,
+    "obj": _parse_obj_line,
+}
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic GC while building millions of small acyclic objects.
+
+    On success the objects are then frozen (gc.freeze): re-enabling alone would
+    leave them in the young generation, so the next allocations in validate
+    would trigger the collections that the pause skipped.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+        gc.freeze()
+    finally:
+        if was_enabled:
+            gc.enable()
 
-        if block == "wcnf":
-            parts = line.split()
-            if parts[0] != "wcl" or len(parts) < 4 or parts[2] not in ("hard", "soft"):
-                raise ValueError(f"bad wcnf clause line: {line}")
-            w = int(parts[1])
-            hard = (parts[2] == "hard")
-            lits: List[Tuple[int, bool]] = []
-            for tok in parts[3:]:
-                if tok == "0":
-                    break
-                lits.append(parse_lit(tok))
-            cl = Clause(hard=hard, weight=w, lits=lits)
-            (wcnf_hard if hard else wcnf_soft).append(cl)
-            continue
+def parse_wmibo(path: str) -> WMIBO:
+    w = WMIBO(
+        B=0, I=0, R=0, vars={},
+        cnf_hard=[], cnf_soft=[],
+        wcnf_hard=[], wcnf_soft=[],
+        lin={}, ind={},
+        obj_sense=None, obj_terms=[],
+        opts={"feas_tol": 1e-8, "int_tol": 1e-6},
+    )
+    vars_ = w.vars
 
-        if block == "lin":
-            m = re.match(r"^lc\s+(\w+)\s+(<=|>=|=)\s+([^\s]+)\s*:\s*(.*)$", line)
-            if not m:
-                raise ValueError(f"bad linear constraint line: {line}")
-            cid = m.group(1)
-            sense = m.group(2)
-            rhs = float(m.group(3))
-            rest = m.group(4).strip()
-            terms: List[Tuple[float, str, int]] = []
-            if rest:
-                toks = rest.split()
-                if len(toks) % 2 != 0:
-                    raise ValueError(f"odd number of tokens in lin expr: {line}")
-                for j in range(0, len(toks), 2):
-                    coef = float(toks[j])
-                    kind, idx = parse_var(toks[j + 1])
-                    terms.append((coef, kind, idx))
-            if cid in lin:
-                raise ValueError(f"duplicate linear constraint id: {cid}")
-            lin[cid] = LinConstr(cid=cid, sense=sense, rhs=rhs, terms=terms)
-            continue
+    # Parser for the current block's content lines; None outside blocks and for
+    # unknown blocks (whose content is ignored for forward compatibility).
+    handler: Optional[Callable[[WMIBO, str], None]] = None
+    saw_header = False
 
-        if block == "ind":
-            m = re.match(r"^ind\s+(~?b\d+)\s*=>\s*(\w+)$", line)
-            if not m:
-                raise ValueError(f"bad indicator line: {line}")
-            lit = parse_lit(m.group(1))
-            cid = m.group(2)
-            if cid in ind and ind[cid] != lit:
-                ind[cid] = ("CONFLICT",)
-            else:
-                ind[cid] = lit
-            continue
+    with gc_paused():
+        # Stream lines through a large read buffer instead of materializing the
+        # whole file (decoded text + list of lines) up front.
+        with Path(path).open("r", encoding="utf-8", errors="replace", buffering=1 << 20) as f:
+            for raw in f:
+                line = raw.strip()
+                if not line:
+                    continue
+                c0 = line[0]
+                # Comments: '#', or DIMACS-style "c" followed by whitespace/end; NOT "cl"
+                if c0 == "#" or (c0 == "c" and (len(line) == 1 or line[1].isspace())):
+                    continue
 
-        if block == "obj":
-            m = re.match(r"^obj\s+(min|max)\s*:\s*lin\s*(.*)$", line)
-            if not m:
-                raise ValueError(f"bad obj line: {line}")
-            obj_sense = m.group(1)
-            rest = m.group(2).strip()
-            terms: List[Tuple[float, str, int]] = []
-            if rest:
-                toks = rest.split()
-                if len(toks) % 2 != 0:
-                    raise ValueError(f"odd number of tokens in obj expr: {line}")
-                for j in range(0, len(toks), 2):
-                    coef = float(toks[j])
-                    kind, idx = parse_var(toks[j + 1])
-                    terms.append((coef, kind, idx))
-            obj_terms = terms
+                # Directives all start with one of these; block content (cl/wcl/lc/ind) never does.
+                if c0 in "pbeov":
+                    if line.startswith("p "):
+                        parts = line.split()
+                        if len(parts) < 5 or parts[1] != "wmibo":
+                            raise ValueError("invalid header line")
+                        # Accept both:
+                        #   p wmibo 1 B I R ...
+                        #   p wmibo B I R ...
+                        if len(parts) >= 6 and parts[2].isdigit() and int(parts[2]) == 1:
+                            w.B, w.I, w.R = int(parts[3]), int(parts[4]), int(parts[5])
+                        else:
+                            w.B, w.I, w.R = int(parts[2]), int(parts[3]), int(parts[4])
+                        saw_header = True
+                        continue
+
+                    if line.startswith("begin "):
+                        handler = BLOCK_DISPATCH.get(line.split()[1])
+                        continue
+                    if line == "end":
+                        handler = None
+                        continue
+
+                    if line.startswith("opt "):
+                        _, k, v = line.split(maxsplit=2)
+                        try:
+                            w.opts[k] = float(v)
+                        except ValueError:
+                            # ignore non-numeric opts in validator
+                            pass
+                        continue
+
+                    if line.startswith("var "):
+                        parts = line.split()
+                        if len(parts) < 4:
+                            raise ValueError(f"bad var line: {line}")
+                        kind = parts[1]
+                        idx = int(parts[2])
+                        spec = parts[3]
+                        if spec == "bin":
+                            vars_[(kind, idx)] = VarDecl(kind, idx, 0.0, 1.0, binary=True)
+                        elif spec == "free":
+                            vars_[(kind, idx)] = VarDecl(kind, idx, -INF, INF, free=True)
+                        else:
+                            lo, hi = parse_bounds(spec)
+                            vars_[(kind, idx)] = VarDecl(kind, idx, lo, hi)
+                        continue
+
+                # ---- block content ----
+                # Unknown content outside supported blocks: ignore (forward compatibility)
+                # If you prefer strict mode, raise here.
+                if handler is not None:
+                    handler(w, line)
+
+        if not saw_header:
+            raise ValueError("missing header 'p wmibo ...'")
+
+        dedup_count = 0
+        trivial_soft = 0
+        for name in CLAUSE_POOLS:
+            unique, merged, dropped = dedup_clauses(getattr(w, name), w.B)
+            setattr(w, name, unique)
+            dedup_count += merged
+            if name.endswith("_soft"):
+                trivial_soft += dropped
+        w.opts["dedup_count"] = float(dedup_count)
+        w.opts["trivial_soft"] = float(trivial_soft)
+
+        packed_pools(w)
+        packed_lin(w)
+    return w
+
+def dedup_clauses(clauses: List[Clause], B: int) -> Tuple[List[Clause], int, int]:
+    """(pool without duplicates and droppable tautologies, merged count, dropped count)."""
+    # Keyed on the literal sequence, not the set: clause_satisfied stops at the
+    # first true or unassigned literal, so reordered clauses can differ.
+    seen: Dict[bytes, Clause] = {}
+    first_of = seen.setdefault
+    unique: List[Clause] = []
+    dropped = 0
+    for j, cl in enumerate(clauses, 1):
+        cl.index = j
+        # over b1..b<B> a tautology is true, or a missing value already fails the domain check
+        if cl.taut and max(map(abs, cl.lits)) <= B:
+            dropped += 1
             continue
+        first = first_of(cl.lits.tobytes(), cl)
+        if first is cl:
+            unique.append(cl)
+        else:
+            first.copies += 1
+            if not cl.hard:
+                first.weight += cl.weight
+    return unique, len(clauses) - dropped - len(unique), dropped
+
+# ---------- Clause packing ----------
+
+def overflow_codes(codes: array, B: int, slots: Dict[int, int]) -> array:
+    """codes with each boolean above B moved to its slot in slots (new ones get the next slot).
+
+    Sizing truth tables by the largest index a clause names would let one
+    "b200000000" allocate hundreds of MB; the slots keep every table at B plus
+    the number of distinct out-of-header booleans.
+    """
+    lim = 2 * B + 1
+
+    def slot_code(code: int) -> int:
+        if code <= lim:
+            return code
+        k = slots.get(code >> 1)
+        if k is None:
+            k = slots[code >> 1] = B + len(slots) + 1
+        return 2 * k + (code & 1)
+
+    return array("q", map(slot_code, codes))
+
+def pack_clauses(clauses: List[Clause], B: int, slots: Dict[int, int]) -> PackedClauses:
+    # signed literal s -> code 2*|s| + (s < 0)
+    lits = array("q", [s + s if s >= 0 else 1 - s - s for cl in clauses for s in cl.lits])
+    ptr = array("q", [0])
+    ptr.extend(accumulate([len(cl.lits) for cl in clauses]))
+    max_var = (max(lits) >> 1) if lits else 0
+    if max_var > B:
+        lits = overflow_codes(lits, B, slots)
+        max_var = max(lits) >> 1
+    pc = PackedClauses(lits=lits, ptr=ptr, weight=[cl.weight for cl in clauses], max_var=max_var)
+    if lits and len(lits) * BITSET_DENSITY >= max_var * len(clauses):
+        pos_mask: List[int] = []
+        neg_mask: List[int] = []
+        for j in range(len(clauses)):
+            p = q = 0
+            for code in lits[ptr[j]:ptr[j + 1]]:
+                if code & 1:
+                    q |= 1 << (code >> 1)
+                else:
+                    p |= 1 << (code >> 1)
+            pos_mask.append(p)
+            neg_mask.append(q)
+            pc.var_mask |= p | q
+        pc.pos_mask, pc.neg_mask = pos_mask, neg_mask
+    return pc
+
+def pack_lin(rows: List[List[Tuple[float, str, int]]], B: int, I: int, R: int) -> LinMatrix:
+    n = {"b": B, "i": I, "r": R}
+    off = {"b": 0, "i": B, "r": B + I}
+    # Variables past the header counts get one column each after the header
+    # ranges, so a stray "r200000000" costs a column, not a dense x that long.
+    extra: Dict[Tuple[str, int], int] = {}
+    for terms in rows:
+        for _, kind, idx in terms:
+            if idx > n[kind] and (kind, idx) not in extra:
+                extra[(kind, idx)] = B + I + R + len(extra)
+    unknown = B + I + R + len(extra)
+    get_extra = extra.get
+    cols = array("q")
+    coef = array("d")
+    ptr = array("q", [0])
+    for terms in rows:
+        cols.extend([off[kind] + idx - 1 if 0 < idx <= n[kind] else get_extra((kind, idx), unknown)
+                     for _, kind, idx in terms])
+        coef.extend([c for c, _, _ in terms])
+        ptr.append(len(cols))
+    return LinMatrix(cols=cols, coef=coef, ptr=ptr, n_b=B, n_i=I, n_r=R, extra=list(extra))
+
+def packed_lin(w: WMIBO) -> LinMatrix:
+    """Packed lin constraints + objective of w, built on first use."""
+    if w.packed_lin is None:
+        rows = [lc.terms for lc in w.lin.values()] + [w.obj_terms]
+        w.packed_lin = pack_lin(rows, w.B, w.I, w.R)
+        w.packed_lin.ind_code = indicator_codes(w)
+        w.packed_lin.ind_max_var = max([code >> 1 for code in w.packed_lin.ind_code if code >= 0], default=0)
+    return w.packed_lin
+
+def indicator_codes(w: WMIBO) -> array:
+    """Indicator of every packed_lin row (lin constraints in order, then the objective)."""
+    codes = array("q")
+    for cid in w.lin:
+        ind = w.ind.get(cid)
+        if ind is None:
+            codes.append(IND_NONE)
+        elif ind == ("CONFLICT",):
+            codes.append(IND_CONFLICT)
+        else:
+            bi, neg = ind  # type: ignore
+            codes.append(2 * bi + neg)
+    codes.append(IND_NONE)
+    if max(codes) >> 1 > w.B:
+        codes = overflow_codes(codes, w.B, w.b_slots)
+    return codes
+
+def packed_pools(w: WMIBO) -> Dict[str, PackedClauses]:
+    """Packed clause pools of w, built on first use."""
+    if not w.packed:
+        w.packed = {name: pack_clauses(getattr(w, name), w.B, w.b_slots) for name in CLAUSE_POOLS}
+    return w.packed
+
+# ---------- Instance cache ----------
+
+# Cache file = header (source st_mtime_ns, st_size, SHA-256 of this script) + pickled WMIBO.
+# Hashing the script ties a cache to the exact validator version that wrote it,
+# so any change to the pickled classes or to what parsing stores invalidates it.
+_CACHE_HEADER = struct.Struct("<qQ32s")
+
+def parse_wmibo_cached(path: str) -> WMIBO:
+    """parse_wmibo(path), reusing '<path>.cache' while the source's mtime and size match."""
+    st = os.stat(path)
+    script = hashlib.sha256(Path(__file__).read_bytes()).digest()
+    header = _CACHE_HEADER.pack(st.st_mtime_ns, st.st_size, script)
+    cache = path + ".cache"
+    try:
+        with open(cache, "rb") as f:
+            if f.read(_CACHE_HEADER.size) == header:
+                with gc_paused():
+                    w = pickle.load(f)
+                if not isinstance(w, WMIBO):
+                    raise TypeError(f"holds a {type(w).__name__}, not a WMIBO")
+                return w
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # A stale header is silently replaced; a matching one that cannot be loaded is worth a note.
+        print(f"warning: ignoring cache {cache}: {e}", file=sys.stderr)
 
-        # Unknown content outside supported blocks: ignore (forward compatibility)
-        # If you prefer strict mode, raise here.
-
-    if not saw_header:
-        raise ValueError("missing header 'p wmibo ...'")
-
-    return WMIBO(
-        B=B, I=I, R=R, vars=vars_,
-        cnf_hard=cnf_hard, cnf_soft=cnf_soft,
-        wcnf_hard=wcnf_hard, wcnf_soft=wcnf_soft,
-        lin=lin, ind=ind,
-        obj_sense=obj_sense, obj_terms=obj_terms,
-        opts=opts
-    )
+    w = parse_wmibo(path)
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            pickle.dump(w, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return w
 
 # ---------- Solution parsing ----------
 
-@dataclass
+@dataclass(slots=True)
 class Solution:
     status: Optional[str]
     reported_obj: Optional[float]
-    model: Dict[str, float]  # 'b1'->0/1, 'i2'->int, 'r3'->float
+    # Per-kind values by index: x_vals[k] is the value of x<k> (missing if not assigned)
+    b_vals: Dict[int, float]
+    i_vals: Dict[int, float]
+    r_vals: Dict[int, float]
 
 def parse_solution_text(text: str) -> Solution:
     status = None
     reported_obj = None
-    model: Dict[str, float] = {}
+    vals: Dict[str, Dict[int, float]] = {"b": {}, "i": {}, "r": {}}
+    kind_of = vals.get
 
     for raw in text.splitlines():
         line = raw.strip()
@@ -296,31 +610,99 @@ def parse_solution_text(text: str) -> Solution:
             except Exception:
                 pass
         elif line.startswith("v "):
+            # Decode each name once into (kind, idx); names that do not denote a
+            # b/i/r variable (including index 0, which the instance parser
+            # rejects, and zero-padded or non-ASCII indices, which the baseline's
+            # f"{kind}{idx}" lookup never matched) are dropped before float().
             for tok in line.split()[1:]:
-                if "=" not in tok:
-                    continue
-                var, val = tok.split("=", 1)
-                try:
-                    model[var] = float(val)
-                except ValueError:
-                    pass
-
-    return Solution(status=status, reported_obj=reported_obj, model=model)
+                name, eq, val = tok.partition("=")
+                digits = name[1:]
+                if eq and digits.isdecimal() and digits.isascii() and digits[0] != "0":
+                    kind_vals = kind_of(name[0])
+                    if kind_vals is not None:
+                        try:
+                            # Sparse: a stray huge index costs one entry, not a list that long.
+                            kind_vals[int(digits)] = float(val)
+                        except ValueError:
+                            pass
+
+    return Solution(status=status, reported_obj=reported_obj,
+                    b_vals=vals["b"], i_vals=vals["i"], r_vals=vals["r"])
+
+# ---------- Error reporting ----------
+
+# error tag -> message formatter; validate only records (tag, *args) tuples and
+# the messages are formatted once, when the report is printed
+ERROR_MESSAGES: Dict[str, Callable[..., str]] = {
+    "MISSING_VALUE": lambda kind, k: f"missing assignment: {kind}{k}",
+    "NOT_BOOLEAN": lambda k, v: f"b{k} not boolean (0/1): {v}",
+    "NOT_INTEGRAL": lambda k, v, tol: f"i{k} not integral within int_tol={tol}: {v}",
+    "INT_BOUNDS": lambda k, lo, hi, v: f"i{k} out of bounds [{lo},{hi}]: {v}",
+    "REAL_BOUNDS": lambda k, lo, hi, v, tol: f"r{k} out of bounds [{lo},{hi}] (feas_tol={tol}): {v}",
+    "NO_DECL": lambda kind, k: f"warning: {kind}{k} has no 'var {kind} {k} ...' declaration; skipping bounds check",
+    "CLAUSE_MISSING": lambda hard, label, cl, j: f"{'hard' if hard else 'soft'} {label} clause {clause_ref(cl, j)}: missing bool var",
+    "HARD_VIOLATED": lambda label, cl, j: f"hard {label} clause {clause_ref(cl, j)} violated",
+    "IND_CONFLICT": lambda cid: f"conflicting indicators for constraint '{cid}'",
+    "IND_MISSING": lambda bi, cid: f"missing indicator variable b{bi} for constraint '{cid}'",
+    "LIN_MISSING": lambda cid: f"linear constraint {cid}: missing variable value",
+    "LIN_VIOLATED": lambda cid, lhs, sense, rhs, tol: f"linear {cid} violated: lhs={lhs:.12g} {sense} rhs={rhs:.12g} (tol={tol})",
+    "OBJ_MISSING": lambda: "objective: missing variable value in linear objective",
+    "OBJ_MISMATCH": lambda rep, name, val, tol: f"objective mismatch: reported o={rep:.12g} best_match({name})={val:.12g} |err|={abs(val-rep):.3g} > {tol}",
+}
+WARNING_TAGS = frozenset({"NO_DECL"})
+
+@dataclass(slots=True)
+class ErrorBuilder:
+    """Errors and warnings of one validate() run, as (tag, *args) tuples (see ERROR_MESSAGES)."""
+    items: List[tuple] = field(default_factory=list)
+
+    def add(self, tag: str, *args) -> None:
+        self.items.append((tag, *args))
+
+    def ok(self) -> bool:
+        """True if nothing but warnings was recorded."""
+        return all(item[0] in WARNING_TAGS for item in self.items)
+
+    def render(self) -> Tuple[List[str], List[str]]:
+        """(warnings, failures) as message strings, each in the order recorded."""
+        warnings: List[str] = []
+        failures: List[str] = []
+        for tag, *args in self.items:
+            (warnings if tag in WARNING_TAGS else failures).append(ERROR_MESSAGES[tag](*args))
+        return warnings, failures
 
 # ---------- Evaluation ----------
 
-def get_model_value(sol: Solution, kind: str, idx: int) -> Optional[float]:
-    return sol.model.get(f"{kind}{idx}")
+def kind_values(sol: Solution, kind: str) -> Dict[int, float]:
+    return sol.b_vals if kind == "b" else (sol.i_vals if kind == "i" else sol.r_vals)
+
+def dense_values(sol: Solution, kind: str, n: int) -> List[Optional[float]]:
+    """Values of kind's variables 1..n as a dense list (None where missing)."""
+    return list(map(kind_values(sol, kind).get, range(1, n + 1)))
+
+def bound_arrays(w: WMIBO, kind: str, n: int) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+    """Dense (lo, hi) lists for kind's variables 1..n (None if undeclared, +-inf if free)."""
+    lo: List[Optional[float]] = [None] * n
+    hi: List[Optional[float]] = [None] * n
+    for (vk, idx), decl in w.vars.items():
+        if vk != kind or not (1 <= idx <= n):
+            continue
+        if kind == "r" and decl.free:
+            lo[idx - 1], hi[idx - 1] = -math.inf, math.inf
+        else:
+            lo[idx - 1], hi[idx - 1] = decl.lo, decl.hi
+    return lo, hi
 
 def lit_value(sol: Solution, bi: int, neg: bool) -> Optional[int]:
-    v = get_model_value(sol, "b", bi)
+    v = sol.b_vals.get(bi)
     if v is None:
         return None
     b = 1 if v >= 0.5 else 0
     return (1 - b) if neg else b
 
 def clause_satisfied(sol: Solution, cl: Clause) -> Optional[bool]:
-    for (bi, neg) in cl.lits:
+    for s in cl.lits:
+        bi, neg = (s, False) if s > 0 else (-s, True)
         t = lit_value(sol, bi, neg)
         if t is None:
             return None
@@ -328,135 +710,281 @@ def clause_satisfied(sol: Solution, cl: Clause) -> Optional[bool]:
             return True
     return False
 
-def eval_lin(sol: Solution, terms: List[Tuple[float, str, int]]) -> Optional[float]:
-    s = 0.0
-    for coef, kind, idx in terms:
-        v = get_model_value(sol, kind, idx)
-        if v is None:
-            return None
-        s += coef * v
-    return s
-
-def is_active_constraint(w: WMIBO, sol: Solution, cid: str) -> Tuple[bool, Optional[str]]:
-    """Returns (active?, error_str_if_any)."""
-    ind = w.ind.get(cid)
-    if ind is None:
-        return True, None
-    if ind == ("CONFLICT",):
-        return False, f"conflicting indicators for constraint '{cid}'"
-    bi, neg = ind  # type: ignore
-    t = lit_value(sol, bi, neg)
-    if t is None:
-        return False, f"missing indicator variable b{bi} for constraint '{cid}'"
-    return (t == 1), None
-
-def validate(w: WMIBO, sol: Solution) -> Tuple[bool, List[str], Dict[str, float]]:
-    errs: List[str] = []
+# Literal truth values in a truth table: 0 false, 1 true, 2 variable unassigned.
+_NEGATE_TRUTH = bytes([1, 0, 2]) + bytes(253)
+
+def literal_truth_table(w: WMIBO, sol: Solution) -> bytes:
+    """Truth value of every packed literal code 2*k + neg for k in 0..bool_width(w)."""
+    n = bool_width(w)
+    b_vals = sol.b_vals
+    values = dense_values(sol, "b", w.B) + [b_vals.get(bi) for bi in w.b_slots]
+    vals = bytes(2 if v is None else (1 if v >= 0.5 else 0) for v in values)
+    table = bytearray(b"\x02" * (2 * (n + 1)))
+    table[2::2] = vals
+    table[3::2] = vals.translate(_NEGATE_TRUTH)
+    return bytes(table)
+
+# truth-table value (0/1/2) -> ASCII bit of the assignment / of its complement / of "unassigned"
+_TRUE_BIT = bytes.maketrans(b"\x00\x01\x02", b"010")
+_FALSE_BIT = bytes.maketrans(b"\x00\x01\x02", b"100")
+_MISSING_BIT = bytes.maketrans(b"\x00\x01\x02", b"001")
+
+def assignment_bitsets(truth: bytes) -> Tuple[int, int, int]:
+    """(true, false, unassigned) variable bitsets of a truth table; bit k <-> b<k>."""
+    vals = truth[::2][::-1]
+    return (int(vals.translate(_TRUE_BIT), 2), int(vals.translate(_FALSE_BIT), 2),
+            int(vals.translate(_MISSING_BIT), 2))
+
+# status byte from wmibo_kernels.clause_status -> clause_satisfied result
+_CLAUSE_STATUS = (False, True, None)
+
+def eval_packed(pc: PackedClauses, truth: bytes,
+                bitsets: Optional[Tuple[int, int, int]] = None) -> List[Optional[bool]]:
+    """clause_satisfied for every clause of a packed pool."""
+    if pc.pos_mask is not None:
+        t_bits, f_bits, m_bits = bitsets if bitsets is not None else assignment_bitsets(truth)
+        if not (pc.var_mask & m_bits):
+            return [bool((p & t_bits) or (q & f_bits)) for p, q in zip(pc.pos_mask, pc.neg_mask)]
+    if wmibo_kernels is not None and wmibo_kernels.ENABLED:
+        status = wmibo_kernels.clause_status(pc.lits, pc.ptr, truth)
+        return list(map(_CLAUSE_STATUS.__getitem__, status))
+    lt = bytes(map(truth.__getitem__, pc.lits))
+    ptr = pc.ptr
+    if 2 not in lt:
+        return [lt.find(1, s, e) >= 0 for s, e in zip(ptr, ptr[1:])]
+    out: List[Optional[bool]] = []
+    for s, e in zip(ptr, ptr[1:]):
+        t = lt.find(1, s, e)
+        m = lt.find(2, s, e)
+        if m < 0:
+            out.append(t >= 0)
+        else:
+            out.append(True if 0 <= t < m else None)
+    return out
+
+def eval_lin_matrix(A: LinMatrix, sol: Solution) -> List[Optional[float]]:
+    """Value of every row of A (None where a row uses an unassigned variable)."""
+    x = dense_values(sol, "b", A.n_b) + dense_values(sol, "i", A.n_i) + dense_values(sol, "r", A.n_r)
+    x += [kind_values(sol, kind).get(idx) for kind, idx in A.extra] + [None]
+    missing = bytes(v is None for v in x)
+    xs = [math.nan if v is None else v for v in x]
+    ptr = A.ptr
+    if wmibo_kernels is not None and wmibo_kernels.ENABLED:
+        lhs, row_missing = wmibo_kernels.lin_values(A.cols, A.coef, ptr, xs, missing)
+        if 1 not in row_missing:
+            return lhs
+        return [None if m else v for v, m in zip(lhs, row_missing)]
+    prods = list(map(operator.mul, A.coef, map(xs.__getitem__, A.cols)))
+    row_missing = bytes(map(missing.__getitem__, A.cols))
+    # Left-to-right float additions, like the per-term loop (sum() compensates from 3.12 on)
+    if 1 not in row_missing:
+        return [reduce(operator.add, prods[s:e], 0.0) for s, e in zip(ptr, ptr[1:])]
+    return [None if row_missing.find(1, s, e) >= 0 else reduce(operator.add, prods[s:e], 0.0)
+            for s, e in zip(ptr, ptr[1:])]
+
+@dataclass(slots=True)
+class ClauseEval:
+    """Clause results of one solution: per-pool clause_satisfied values and soft totals."""
+    sats: Dict[str, List[Optional[bool]]]
+    penalty: float
+    soft_violations: int
+    # Per pool, per clause: offset in cl.lits of the literal to try first (the last
+    # one seen true). Filled in by validate_incremental.
+    witness: Optional[Dict[str, array]] = None
+    truth: bytes = b""   # literal truth table the results were computed from
+
+def bool_width(w: WMIBO) -> int:
+    """Highest packed boolean index: B, or the last slot of w.b_slots."""
+    return max([w.B, packed_lin(w).ind_max_var] + [pc.max_var for pc in packed_pools(w).values()])
+
+def bool_index(w: WMIBO, k: int) -> int:
+    """The bi of packed boolean index k (k itself unless it is a w.b_slots slot)."""
+    if k <= w.B:
+        return k
+    return next(bi for bi, slot in w.b_slots.items() if slot == k)
+
+T = TypeVar("T")
+
+def eval_workers(n_tasks: int) -> int:
+    """Threads to spread n_tasks independent evaluations over (1 = run them inline)."""
+    kernels = wmibo_kernels is not None and wmibo_kernels.ENABLED
+    # parallel=True kernels already use every core, and numba's workqueue
+    # layer aborts on concurrent parallel launches.
+    if kernels and wmibo_kernels.PARALLEL:
+        return 1
+    # Otherwise threads only help without the GIL: on a free-threaded
+    # interpreter, or inside the (single-threaded, nogil) kernels.
+    if getattr(sys, "_is_gil_enabled", lambda: True)() and not kernels:
+        return 1
+    return max(1, min(n_tasks, os.cpu_count() or 1))
+
+def run_tasks(tasks: List[Callable[[], T]]) -> List[T]:
+    """Results of tasks, in order; run on a thread pool when eval_workers allows (never nest)."""
+    workers = eval_workers(len(tasks))
+    if workers <= 1:
+        return [task() for task in tasks]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return [f.result() for f in [ex.submit(task) for task in tasks]]
+
+def pool_tasks(w: WMIBO, sol: Solution) -> Tuple[bytes, List[Callable[[], List[Optional[bool]]]]]:
+    """(literal truth table of sol, one eval_packed task per pool in CLAUSE_POOLS order)."""
+    packed = packed_pools(w)
+    truth = literal_truth_table(w, sol)
+    bitsets = assignment_bitsets(truth) if any(pc.pos_mask is not None for pc in packed.values()) else None
+    return truth, [partial(eval_packed, packed[name], truth, bitsets) for name in CLAUSE_POOLS]
+
+def eval_clause_pools(w: WMIBO, sol: Solution) -> ClauseEval:
+    truth, tasks = pool_tasks(w, sol)
+    return clause_eval(w, truth, run_tasks(tasks))
+
+def clause_eval(w: WMIBO, truth: bytes, results: List[List[Optional[bool]]]) -> ClauseEval:
+    """ClauseEval from the per-pool results of pool_tasks."""
+    sats = dict(zip(CLAUSE_POOLS, results))
+
+    # Merged duplicates carry the summed weight (cl soft: one per copy) and
+    # count once per copy as violations.
+    penalty = 0.0
+    soft_violations = 0
+    for pool in ("cnf_soft", "wcnf_soft"):
+        for cl, sat in zip(getattr(w, pool), sats[pool]):
+            if sat is False:
+                penalty += float(cl.weight)
+                soft_violations += cl.copies
+    return ClauseEval(sats=sats, penalty=penalty, soft_violations=soft_violations, truth=truth)
+
+def clause_ref(cl: Clause, pos: int) -> str:
+    """'#<file position>' of a clause, noting merged duplicates."""
+    ref = f"#{cl.index or pos}"
+    if cl.copies > 1:
+        ref += f" (+{cl.copies - 1} duplicate{'s' if cl.copies > 2 else ''})"
+    return ref
+
+# literal truth value (0/1/2) or the IND_CONFLICT entry (3) -> row activation status
+ROW_INACTIVE, ROW_ACTIVE, ROW_MISSING_IND, ROW_CONFLICT = 0, 1, 2, 3
+
+def row_activation(A: LinMatrix, truth: bytes) -> bytes:
+    """Activation status of every row of A; truth must cover A.ind_max_var."""
+    # IND_CONFLICT / IND_NONE index these two trailing entries
+    table = truth + bytes([ROW_CONFLICT, ROW_ACTIVE])
+    return bytes(map(table.__getitem__, A.ind_code))
+
+def validate(w: WMIBO, sol: Solution) -> Tuple[bool, ErrorBuilder, Dict[str, float]]:
+    errs = ErrorBuilder()
     feas_tol = float(w.opts.get("feas_tol", 1e-8))
     int_tol = float(w.opts.get("int_tol", 1e-6))
 
     # --- variable presence and domains ---
-    for k in range(1, w.B + 1):
-        v = get_model_value(sol, "b", k)
+    # Values and bounds are materialized once as dense per-kind arrays; each
+    # kind's checks run as one filtering pass, and the detailed messages are
+    # only built for the offending indices.
+    b_vals = dense_values(sol, "b", w.B)
+    i_vals = dense_values(sol, "i", w.I)
+    r_vals = dense_values(sol, "r", w.R)
+
+    bad_b = [k for k, v in enumerate(b_vals, 1)
+             if v is None or not (abs(v) <= 1e-9 or abs(v - 1.0) <= 1e-9)]
+    for k in bad_b:
+        v = b_vals[k - 1]
         if v is None:
-            errs.append(f"missing assignment: b{k}")
+            errs.add("MISSING_VALUE", "b", k)
         else:
-            if not (abs(v - 0.0) <= 1e-9 or abs(v - 1.0) <= 1e-9):
-                errs.append(f"b{k} not boolean (0/1): {v}")
-
-    for k in range(1, w.I + 1):
-        v = get_model_value(sol, "i", k)
+            errs.add("NOT_BOOLEAN", k, v)
+
+    i_lo, i_hi = bound_arrays(w, "i", w.I)
+    bad_i = [k for k, v, lo, hi in zip(range(1, w.I + 1), i_vals, i_lo, i_hi)
+             if v is None or lo is None or abs(v - round(v)) > int_tol
+             or v < lo - int_tol or v > hi + int_tol]
+    for k in bad_i:
+        v = i_vals[k - 1]
         if v is None:
-            errs.append(f"missing assignment: i{k}")
+            errs.add("MISSING_VALUE", "i", k)
+            continue
+        if abs(v - round(v)) > int_tol:
+            errs.add("NOT_INTEGRAL", k, v, int_tol)
+        lo, hi = i_lo[k - 1], i_hi[k - 1]
+        if lo is not None:
+            if v < lo - int_tol or v > hi + int_tol:
+                errs.add("INT_BOUNDS", k, lo, hi, v)
+        # if no decl, we allow but warn:
         else:
-            if abs(v - round(v)) > int_tol:
-                errs.append(f"i{k} not integral within int_tol={int_tol}: {v}")
-            decl = w.vars.get(("i", k))
-            if decl is not None:
-                if v < decl.lo - int_tol or v > decl.hi + int_tol:
-                    errs.append(f"i{k} out of bounds [{decl.lo},{decl.hi}]: {v}")
-            # if no decl, we allow but warn:
-            else:
-                errs.append(f"warning: i{k} has no 'var i {k} ...' declaration; skipping bounds check")
-
-    for k in range(1, w.R + 1):
-        v = get_model_value(sol, "r", k)
+            errs.add("NO_DECL", "i", k)
+
+    r_lo, r_hi = bound_arrays(w, "r", w.R)
+    bad_r = [k for k, v, lo, hi in zip(range(1, w.R + 1), r_vals, r_lo, r_hi)
+             if v is None or lo is None or v < lo - feas_tol or v > hi + feas_tol]
+    for k in bad_r:
+        v = r_vals[k - 1]
         if v is None:
-            errs.append(f"missing assignment: r{k}")
+            errs.add("MISSING_VALUE", "r", k)
+            continue
+        lo, hi = r_lo[k - 1], r_hi[k - 1]
+        if lo is not None:
+            errs.add("REAL_BOUNDS", k, lo, hi, v, feas_tol)
         else:
-            decl = w.vars.get(("r", k))
-            if decl is not None and not decl.free:
-                if v < decl.lo - feas_tol or v > decl.hi + feas_tol:
-                    errs.append(f"r{k} out of bounds [{decl.lo},{decl.hi}] (feas_tol={feas_tol}): {v}")
-            elif decl is None:
-                errs.append(f"warning: r{k} has no 'var r {k} ...' declaration; skipping bounds check")
+            errs.add("NO_DECL", "r", k)
 
     # --- hard CNF/WCNF ---
-    for j, cl in enumerate(w.cnf_hard, 1):
-        sat = clause_satisfied(sol, cl)
+    # Clause pools and linear rows are independent; evaluate both up front.
+    A = packed_lin(w)
+    truth, tasks = pool_tasks(w, sol)
+    *results, lhs_all = run_tasks(tasks + [partial(eval_lin_matrix, A, sol)])
+    ce = clause_eval(w, truth, results)
+    sats = ce.sats
+
+    for j, (cl, sat) in enumerate(zip(w.cnf_hard, sats["cnf_hard"]), 1):
         if sat is None:
-            errs.append(f"hard CNF clause #{j}: missing bool var")
+            errs.add("CLAUSE_MISSING", True, "CNF", cl, j)
         elif not sat:
-            errs.append(f"hard CNF clause #{j} violated")
+            errs.add("HARD_VIOLATED", "CNF", cl, j)
 
-    for j, cl in enumerate(w.wcnf_hard, 1):
-        sat = clause_satisfied(sol, cl)
+    for j, (cl, sat) in enumerate(zip(w.wcnf_hard, sats["wcnf_hard"]), 1):
         if sat is None:
-            errs.append(f"hard WCNF clause #{j}: missing bool var")
+            errs.add("CLAUSE_MISSING", True, "WCNF", cl, j)
         elif not sat:
-            errs.append(f"hard WCNF clause #{j} violated")
+            errs.add("HARD_VIOLATED", "WCNF", cl, j)
 
     # --- soft penalties ---
-    penalty = 0.0
-    soft_violations = 0
+    penalty = ce.penalty
+    soft_violations = ce.soft_violations
 
-    for j, cl in enumerate(w.cnf_soft, 1):
-        sat = clause_satisfied(sol, cl)
-        if sat is None:
-            errs.append(f"soft CNF clause #{j}: missing bool var")
-            continue
-        if not sat:
-            penalty += 1.0
-            soft_violations += 1
-
-    for j, cl in enumerate(w.wcnf_soft, 1):
-        sat = clause_satisfied(sol, cl)
-        if sat is None:
-            errs.append(f"soft WCNF clause #{j}: missing bool var")
-            continue
-        if not sat:
-            penalty += float(cl.weight)
-            soft_violations += 1
+    for pool, label in (("cnf_soft", "CNF"), ("wcnf_soft", "WCNF")):
+        for j, (cl, sat) in enumerate(zip(getattr(w, pool), sats[pool]), 1):
+            if sat is None:
+                errs.add("CLAUSE_MISSING", False, label, cl, j)
 
     # --- linear constraints ---
-    for cid, lc in w.lin.items():
-        active, e = is_active_constraint(w, sol, cid)
-        if e:
+    activation = row_activation(A, ce.truth)
+    for row, (cid, lc) in enumerate(w.lin.items()):
+        status = activation[row]
+        if status == ROW_INACTIVE:
+            continue
+        if status == ROW_CONFLICT:
             # It's a format/solution consistency problem; record it.
-            errs.append(e)
+            errs.add("IND_CONFLICT", cid)
             continue
-        if not active:
+        if status == ROW_MISSING_IND:
+            errs.add("IND_MISSING", bool_index(w, A.ind_code[row] >> 1), cid)
             continue
 
-        lhs = eval_lin(sol, lc.terms)
+        lhs = lhs_all[row]
         if lhs is None:
-            errs.append(f"linear constraint {cid}: missing variable value")
+            errs.add("LIN_MISSING", cid)
             continue
 
         if lc.sense == "<=":
             if lhs > lc.rhs + feas_tol:
-                errs.append(f"linear {cid} violated: lhs={lhs:.12g} <= rhs={lc.rhs:.12g} (tol={feas_tol})")
+                errs.add("LIN_VIOLATED", cid, lhs, "<=", lc.rhs, feas_tol)
         elif lc.sense == ">=":
             if lhs < lc.rhs - feas_tol:
-                errs.append(f"linear {cid} violated: lhs={lhs:.12g} >= rhs={lc.rhs:.12g} (tol={feas_tol})")
+                errs.add("LIN_VIOLATED", cid, lhs, ">=", lc.rhs, feas_tol)
         else:  # "="
             if abs(lhs - lc.rhs) > feas_tol:
-                errs.append(f"linear {cid} violated: lhs={lhs:.12g} = rhs={lc.rhs:.12g} (tol={feas_tol})")
+                errs.add("LIN_VIOLATED", cid, lhs, "=", lc.rhs, feas_tol)
 
     # --- objective ---
-    lin_obj = eval_lin(sol, w.obj_terms) if w.obj_terms else 0.0
+    lin_obj = lhs_all[-1] if w.obj_terms else 0.0
     if lin_obj is None:
-        errs.append("objective: missing variable value in linear objective")
+        errs.add("OBJ_MISSING")
         lin_obj = float("nan")
 
     # Candidate totals depending on conventions
@@ -491,17 +1019,108 @@ def validate(w: WMIBO, sol: Solution) -> Tuple[bool, List[str], Dict[str, float]
         stats["best_match_value"] = float(best_val)
         stats["best_abs_error"] = float(abs(best_val - sol.reported_obj))
         if abs(best_val - sol.reported_obj) > tol_obj:
-            errs.append(f"objective mismatch: reported o={sol.reported_obj:.12g} best_match({best_name})={best_val:.12g} |err|={abs(best_val-sol.reported_obj):.3g} > {tol_obj}")
-
-    ok = all(not e.startswith("hard ") and "violated" not in e and "missing assignment" not in e and "objective mismatch" not in e
-             for e in errs) and not any("violated" in e and e.startswith("hard") for e in errs)
+            errs.add("OBJ_MISMATCH", sol.reported_obj, best_name, best_val, tol_obj)
 
     # Treat any non-warning error as failure
-    fatal = [e for e in errs if not e.startswith("warning:")]
-    ok = (len(fatal) == 0)
+    ok = errs.ok()
 
     return ok, errs, stats
 
+# ---------- Incremental validation ----------
+
+LiteralIndex = Tuple[List[array], List[array]]  # (pos, neg): [bi] -> global clause ids
+
+def build_literal_index(w: WMIBO) -> LiteralIndex:
+    """Per-polarity occurrence lists of every boolean, as global clause ids over CLAUSE_POOLS."""
+    n = bool_width(w)
+    pos = [array("q") for _ in range(n + 1)]
+    neg = [array("q") for _ in range(n + 1)]
+    base = 0
+    packed = packed_pools(w)
+    for name in CLAUSE_POOLS:
+        pc = packed[name]
+        lits, ptr = pc.lits, pc.ptr
+        for j in range(len(ptr) - 1):
+            for code in lits[ptr[j]:ptr[j + 1]]:
+                (neg if code & 1 else pos)[code >> 1].append(base + j)
+        base += len(ptr) - 1
+    return pos, neg
+
+def clause_satisfied_from(codes: array, truth: bytes, start: int) -> Tuple[bool, int]:
+    """(clause_satisfied, witness offset) of a clause's packed literal codes under a
+    complete assignment, trying codes[start] first."""
+    n = len(codes)
+    for t in range(start, start + n):
+        t %= n
+        if truth[codes[t]] == 1:
+            return True, t
+    return False, start
+
+def validate_incremental(w: WMIBO, prev_sol: Solution, new_sol: Solution,
+                         prev: Optional[ClauseEval] = None,
+                         index: Optional[LiteralIndex] = None) -> ClauseEval:
+    """Clause results of new_sol, re-evaluating only clauses that touch a changed boolean."""
+    # Pass the result back as prev next time and reuse index; lin rows are not covered.
+    if prev is None:
+        prev = eval_clause_pools(w, prev_sol)
+    if index is None:
+        index = build_literal_index(w)
+    pos, neg = index
+    n = bool_width(w)
+
+    # A boolean "changes" when its truth value (0/1/unassigned) does; prev.truth
+    # already holds prev_sol's table unless prev was built by hand.
+    old_truth = prev.truth if len(prev.truth) == 2 * (n + 1) else literal_truth_table(w, prev_sol)
+    truth = literal_truth_table(w, new_sol)
+    old_vals = old_truth[::2]
+    new_vals = truth[::2]
+    changed = [k for k, (a, b) in enumerate(zip(old_vals, new_vals)) if a != b]
+    if not changed:
+        return ClauseEval(sats=prev.sats, penalty=prev.penalty, soft_violations=prev.soft_violations,
+                          witness=prev.witness, truth=prev.truth)
+
+    dirty = set()
+    for k in changed:
+        dirty.update(pos[k])
+        dirty.update(neg[k])
+
+    sats = {name: list(v) for name, v in prev.sats.items()}
+    if prev.witness is None:
+        witness = {name: array("q", bytes(8 * len(sats[name]))) for name in CLAUSE_POOLS}
+    else:
+        witness = {name: array("q", v) for name, v in prev.witness.items()}
+    # Witness-first scans are only order-independent when every boolean a clause
+    # can mention is assigned (slot 0 is never used).
+    complete = 2 not in new_vals[1:]
+
+    packed = packed_pools(w)
+    starts = list(accumulate([0] + [len(sats[name]) for name in CLAUSE_POOLS]))
+    penalty = prev.penalty
+    soft_violations = prev.soft_violations
+    for c in sorted(dirty):
+        p = bisect_right(starts, c) - 1
+        name, j = CLAUSE_POOLS[p], c - starts[p]
+        cl = getattr(w, name)[j]
+        if complete:
+            pc = packed[name]
+            new, witness[name][j] = clause_satisfied_from(pc.lits[pc.ptr[j]:pc.ptr[j + 1]], truth,
+                                                          witness[name][j])
+        else:
+            new = clause_satisfied(new_sol, cl)
+        old = sats[name][j]
+        if old is new:
+            continue
+        sats[name][j] = new
+        if not cl.hard:
+            if old is False:
+                penalty -= float(cl.weight)
+                soft_violations -= cl.copies
+            if new is False:
+                penalty += float(cl.weight)
+                soft_violations += cl.copies
+    return ClauseEval(sats=sats, penalty=penalty, soft_violations=soft_violations, witness=witness,
+                      truth=truth)
+
 # ---------- Main ----------
 
 def main() -> int:
@@ -509,10 +1128,13 @@ def main() -> int:
     ap.add_argument("instance", help="path to .wmibo instance")
     ap.add_argument("--sol", help="path to solver output; if omitted, read from stdin", default=None)
     ap.add_argument("--show-soft", action="store_true", help="print which soft clauses are violated (indices)")
+    ap.add_argument("--cache", action="store_true",
+                    help="reuse/write a parsed copy of the instance in <instance>.cache (keyed by mtime+size "
+                         "and the validator's own source)")
     args = ap.parse_args()
 
     try:
-        w = parse_wmibo(args.instance)
+        w = parse_wmibo_cached(args.instance) if args.cache else parse_wmibo(args.instance)
     except Exception as e:
         print(f"PARSE ERROR (instance): {e}", file=sys.stderr)
         return 2
@@ -538,6 +1160,10 @@ def main() -> int:
         print(f"  o(reported): {sol.reported_obj:.12g}")
     print(f"  lin_obj:  {stats['lin_obj']:.12g}")
     print(f"  penalty:  {stats['penalty']:.12g}   (soft_violations={int(stats['soft_violations'])})")
+    if w.opts.get("dedup_count"):
+        print(f"  dedup:    {int(w.opts['dedup_count'])} duplicate clauses merged")
+    if w.opts.get("trivial_soft"):
+        print(f"  trivial:  {int(w.opts['trivial_soft'])} tautological soft clauses dropped (always satisfied)")
     print(f"  total_min:        {stats['total_min']:.12g}")
     print(f"  total_internal:   {stats['total_internal']:.12g}")
     print(f"  total_max_orig:   {stats['total_max_original']:.12g}")
@@ -545,8 +1171,7 @@ def main() -> int:
         print(f"  best_match: {stats['best_match']}  value={stats['best_match_value']:.12g}  abs_err={stats['best_abs_error']:.3g}")
 
     # Errors/warnings
-    warnings = [e for e in errs if e.startswith("warning:")]
-    failures = [e for e in errs if not e.startswith("warning:")]
+    warnings, failures = errs.render()
 
     if warnings:
         print("\nWARNINGS:")
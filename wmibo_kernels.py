@@ -0,0 +1,92 @@
+"""
+Optional JIT kernels for the WMIBO solution validator (v1.0)
+
+validate_wmibo_solution.py uses these kernels for its packed clause pools and
+its packed linear rows when they are switched on and numba (and numpy) are
+installed; otherwise it keeps its own pure-Python evaluation. The kernels are
+plain Python loops, so without numba they still run (slowly) and give the
+same results.
+
+Environment:
+  WMIBO_NUMBA=1            use the kernels (off by default; numba is not even imported)
+  WMIBO_NUMBA_PARALLEL=0   compile without parallel=True (single-threaded prange)
+
+Kernels are compiled lazily on first call (no signatures in the decorator),
+release the GIL, and are cached on disk (numba's cache=True, in __pycache__), so
+only the first run after installing or editing this module pays the compile
+time. With WMIBO_NUMBA_PARALLEL=0 the validator runs several of them at once
+on threads; parallel kernels are only ever launched one at a time.
+
+© Oscar Riveros. Todos los derechos reservados.
+"""
+import os
+
+numba = None
+np = None
+if os.environ.get("WMIBO_NUMBA", "0") == "1":
+    # Importing numba alone costs a few hundred ms; only pay it when asked to.
+    try:
+        import numba
+        import numpy as np
+    except ImportError:
+        numba = None
+        np = None
+
+ENABLED = numba is not None
+PARALLEL = os.environ.get("WMIBO_NUMBA_PARALLEL", "1") != "0"
+
+if numba is not None:
+    _jit = numba.njit(parallel=PARALLEL, nogil=True, cache=True, boundscheck=False, error_model="numpy")
+    prange = numba.prange
+else:
+    def _jit(fn):
+        return fn
+    prange = range
+
+# ---------- Kernels ----------
+
+@_jit
+def eval_clauses(lits, ptr, truth, out):
+    """out[j] = truth (0/1/2) of clause j's first literal that is not false, else 0."""
+    for j in prange(len(ptr) - 1):
+        r = 0
+        for t in range(ptr[j], ptr[j + 1]):
+            v = truth[lits[t]]
+            if v != 0:
+                r = v
+                break
+        out[j] = r
+
+@_jit
+def eval_lin(cols, coef, ptr, x, missing, lhs, row_missing):
+    """lhs[j] = sum of coef * x over row j's CSR segment; row_missing[j] = 1 if it uses a missing column."""
+    for j in prange(len(ptr) - 1):
+        s = 0.0
+        m = 0
+        for t in range(ptr[j], ptr[j + 1]):
+            c = cols[t]
+            if missing[c]:
+                m = 1
+                break
+            s += coef[t] * x[c]
+        lhs[j] = 0.0 if m else s
+        row_missing[j] = m
+
+# ---------- Array adapters ----------
+
+def clause_status(lits, ptr, truth: bytes) -> bytes:
+    """eval_clauses over array('q') CSR buffers; returns one status byte per clause."""
+    out = np.empty(len(ptr) - 1, dtype=np.uint8)
+    eval_clauses(np.frombuffer(lits, dtype=np.int64), np.frombuffer(ptr, dtype=np.int64),
+                 np.frombuffer(truth, dtype=np.uint8), out)
+    return out.tobytes()
+
+def lin_values(cols, coef, ptr, x, missing: bytes):
+    """eval_lin over array('q'/'d') CSR buffers; returns (lhs list, row-missing bytes)."""
+    n = len(ptr) - 1
+    lhs = np.empty(n, dtype=np.float64)
+    row_missing = np.empty(n, dtype=np.uint8)
+    eval_lin(np.frombuffer(cols, dtype=np.int64), np.frombuffer(coef, dtype=np.float64),
+             np.frombuffer(ptr, dtype=np.int64), np.asarray(x, dtype=np.float64),
+             np.frombuffer(missing, dtype=np.uint8), lhs, row_missing)
+    return lhs.tolist(), row_missing.tobytes()